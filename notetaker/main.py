@@ -15,6 +15,9 @@ import traceback
 import pdb
 from collections import namedtuple, OrderedDict
 import difflib
+import hashlib
+import json
+import time
 
 ENCODING = u('utf-8')
 NEWLINE = u('\n')
@@ -33,6 +36,9 @@ summary_dir = Path(config_parser.get('common', 'summary_directory'))
 merge_dir = Path(config_parser.get('common', 'merge_directory'))
 tag_marker = config_parser.get('common', 'tag_marker')
 propagate_changes_interval = config_parser.getint('common', 'propagate_changes_interval')
+summary_cache_max_bytes = config_parser.getint('common', 'summary_cache_max_bytes')
+summary_cache_max_age = config_parser.getint('common', 'summary_cache_max_age')
+cache_dir = summary_dir / 'cache'
 
 # searcher can be any of: grep, ag, ack-grep
 searcher = config_parser.get('common', 'searcher')
@@ -48,6 +54,8 @@ cfg = dict(
     merge_dir=merge_dir,
     tag_marker=tag_marker,
     propagate_changes_interval=propagate_changes_interval,
+    summary_cache_max_bytes=summary_cache_max_bytes,
+    summary_cache_max_age=summary_cache_max_age,
     searcher=searcher,
     searcher_args=searcher_args
 )
@@ -189,6 +197,182 @@ def atime(path):
     return path.stat().st_atime
 
 
+def note_fingerprint(path):
+    """ Summarize the on-disk state of a note without reading it.
+
+    ctime is included because notes edited through a summary file have
+    their atime and mtime restored afterwards, but ctime cannot be reset.
+
+    """
+    st = path.stat()
+    return dict(ino=st.st_ino, size=st.st_size, mtime=st.st_mtime_ns, ctime=st.st_ctime_ns)
+
+
+def summary_cache_path(query):
+    """ Path of the cache entry for the summary of ``query``.
+
+    Rendered segments depend on whether tags are shown, so that flag is part
+    of the key. Date headers are added when the summary is assembled, so
+    ``show_date`` is not.
+
+    """
+    key = json.dumps([query, cfg['show_tags']])
+    digest = hashlib.sha1(key.encode(ENCODING)).hexdigest()
+    return cache_dir / "{}.json".format(digest)
+
+
+def is_cached_segment(segment):
+    return (
+        isinstance(segment, dict) and
+        isinstance(segment.get('fingerprint'), dict) and
+        isinstance(segment.get('rendered'), str) and
+        segment['rendered'].startswith(NOTE_HEADER) and
+        isinstance(segment.get('tags'), list) and
+        all(isinstance(t, str) for t in segment['tags']))
+
+
+def load_cached_segments(cache_path):
+    """ Load the rendered segments stored at ``cache_path``, keyed by note path.
+
+    Missing, unreadable or malformed entries are treated as empty.
+
+    """
+    try:
+        with cache_path.open('r', encoding=ENCODING) as f:
+            segments = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(segments, dict):
+        return {}
+    return {path: seg for path, seg in segments.items() if is_cached_segment(seg)}
+
+
+def store_cached_segments(cache_path, segments, cached_segments):
+    """ Write ``segments`` to ``cache_path``.
+
+    If nothing changed since ``cached_segments`` were loaded, the entry is
+    only marked as recently used. The cache is only an optimization, so
+    write failures are ignored.
+
+    """
+    if segments == cached_segments:
+        try:
+            os.utime(str(cache_path))
+        except OSError:
+            pass
+        return
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = NamedTemporaryFile(mode='w',
+                                      encoding=ENCODING,
+                                      dir=str(cache_path.parent),
+                                      suffix='.tmp',
+                                      delete=False)
+    except OSError:
+        return
+
+    try:
+        with tmp_file as f:
+            json.dump(segments, f)
+        os.replace(tmp_file.name, str(cache_path))
+    except OSError:
+        try:
+            os.remove(tmp_file.name)
+        except OSError:
+            pass
+
+
+def prune_summary_dir(keep):
+    """ Evict stale files from the summary directory.
+
+    Leftover summary files and cache entries older than
+    ``summary_cache_max_age`` seconds are removed, then the least recently
+    used cache entries are removed until the cache fits in
+    ``summary_cache_max_bytes``. The cache entry at ``keep`` is never removed.
+    Files that vanish or cannot be removed, e.g. because another session is
+    cleaning up concurrently, are skipped.
+
+    """
+    def stat_files(directory, pattern):
+        try:
+            files = list(directory.glob(pattern))
+        except OSError:
+            return []
+        stats = []
+        for f in files:
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            if f.is_file():
+                stats.append((f, st))
+        return stats
+
+    def unlink(f):
+        try:
+            f.unlink()
+        except OSError:
+            pass
+
+    oldest = time.time() - cfg['summary_cache_max_age']
+
+    leftover = stat_files(summary_dir, '*')
+    entries = stat_files(cache_dir, '*.json')
+
+    kept_size = sum(st.st_size for f, st in entries if f == keep)
+    entries = [(f, st) for f, st in entries if f != keep]
+
+    for f, st in leftover + entries:
+        if st.st_mtime < oldest:
+            unlink(f)
+
+    entries = sorted(
+        [(f, st) for f, st in entries if st.st_mtime >= oldest],
+        key=lambda e: e[1].st_mtime)
+    total = kept_size + sum(st.st_size for f, st in entries)
+    for f, st in entries:
+        if total <= cfg['summary_cache_max_bytes']:
+            break
+        total -= st.st_size
+        unlink(f)
+
+
+def note_from_segment(path, seg, tags):
+    """ Parse the note from ``seg``, the text following a ``NOTE_HEADER``.
+
+    ``tags`` are used when the segment was rendered without them.
+
+    """
+    lines = seg.split(NEWLINE)
+    lines = lines[1:]
+    seg = NEWLINE.join(lines)
+    seg = seg.strip()
+    if cfg['show_tags']:
+        return Note.from_string(path, seg)
+    return Note(path, seg, tags)
+
+
+def render_segment(path, fingerprint, cached):
+    """ Return the note at ``path`` and its rendered summary segment.
+
+    The cached segment is reused if the note's fingerprint is unchanged,
+    otherwise the note is re-read and re-rendered.
+
+    """
+    if cached is not None and cached['fingerprint'] == fingerprint:
+        rendered = cached['rendered']
+        note = note_from_segment(path, rendered[len(NOTE_HEADER):], tuple(cached['tags']))
+        return note, cached
+
+    note = Note.from_path(path)
+    rendered = "{} `{}` {}\n".format(NOTE_HEADER, path.name, "-" * 40)
+    rendered += NEWLINE + note.as_string(cfg['show_tags'])
+    segment = dict(fingerprint=fingerprint, rendered=rendered, tags=list(note.tags))
+    return note, segment
+
+
 def extract_notes_from_summary(notes, summary_file):
     new_summary = Path(summary_file.name).read_text()
 
@@ -207,15 +391,7 @@ def extract_notes_from_summary(notes, summary_file):
     extracted_notes = type(notes)()
 
     for (path, note), seg in zip(notes.items(), segments):
-        lines = seg.split(NEWLINE)
-        lines = lines[1:]
-        seg = NEWLINE.join(lines)
-        seg = seg.strip()
-        if cfg['show_tags']:
-            _note = Note.from_string(path, seg)
-        else:
-            _note = Note(path, seg, note.tags)
-        extracted_notes[path] = _note
+        extracted_notes[path] = note_from_segment(path, seg, note.tags)
 
     return extracted_notes
 
@@ -296,7 +472,13 @@ def perform_diffs(notes, summary_file):
         notes[path] = edited_note
 
 
-def view_notes(paths):
+def view_notes(paths, query):
+    """ Open a summary of the notes at ``paths`` in the viewer.
+
+    ``query`` identifies the view that produced ``paths`` and selects the
+    cache entry from which unchanged notes' rendered segments are reused.
+
+    """
     if not paths:
         print("No matching notes found.")
         return
@@ -306,7 +488,8 @@ def view_notes(paths):
 
     # Sort paths by modification time
     paths = [note_dir / f for f in paths]
-    paths = sorted(paths, key=lambda n: mtime(n))
+    fingerprints = {path: note_fingerprint(path) for path in paths}
+    paths = sorted(paths, key=lambda n: fingerprints[n]['mtime'])
 
     print("Viewing {n} files.".format(n=len(paths)))
     max_paths = 10
@@ -318,31 +501,31 @@ def view_notes(paths):
 
     if not summary_dir.is_dir():
         summary_dir.mkdir(parents=True)
-    else:
-        existing_summary_files = [
-            summary for summary in summary_dir.iterdir() if summary.is_file()]
-        if len(existing_summary_files) > 20:
-            for summary in existing_summary_files:
-                summary.unlink()
+
+    cache_path = summary_cache_path(query)
+    cached_segments = load_cached_segments(cache_path)
 
     try:
         # Populate the summary file
         date = datetime.date.fromtimestamp(0.0)
         to_write = []
+        segments = {}
         original_notes = OrderedDict()
         for path in paths:
-            note = Note.from_path(path)
+            fingerprint = fingerprints[path]
+            note, segment = render_segment(
+                path, fingerprint, cached_segments.get(str(path)))
             original_notes[path] = note
+            segments[str(path)] = segment
 
             if cfg['show_date']:
-                new_date = datetime.datetime.utcfromtimestamp(mtime(path)).date()
+                new_date = datetime.datetime.utcfromtimestamp(fingerprint['mtime'] / 1e9).date()
                 if new_date != date:
                     date_str = new_date.strftime("%Y-%m-%d")
                     to_write.append("{}{}(UTC) {}\n".format(DATE_PREFIX, date_str, "=" * 40))
                     date = new_date
 
-            to_write.append("{} `{}` {}\n".format(NOTE_HEADER, path.name, "-" * 40))
-            to_write.append(note.as_string(cfg['show_tags']))
+            to_write.append(segment['rendered'])
 
         # Latest version of the notes for which there is (after this function call)
         # agreement between the sumamry file and the on-disk notes.
@@ -357,6 +540,9 @@ def view_notes(paths):
 
         summary_path = Path(summary_file.name)
 
+        store_cached_segments(cache_path, segments, cached_segments)
+        prune_summary_dir(keep=cache_path)
+
         summary_mod_time = mtime(summary_path)
 
         command = "{} {}".format(cfg['viewer'], summary_file.name).split()
@@ -472,7 +658,7 @@ def search_view(args):
         viewer=args.viewer,
     )
 
-    view_notes(filenames)
+    view_notes(filenames, ['search', args.pattern])
 
 
 def date_view(args):
@@ -498,7 +684,7 @@ def date_view(args):
         viewer=args.viewer,
     )
 
-    view_notes(filenames)
+    view_notes(filenames, ['date', args.frm, args.to])
 
 
 def tail_view(args):
@@ -527,7 +713,7 @@ def tail_view(args):
         viewer=args.viewer,
     )
 
-    view_notes(filenames)
+    view_notes(filenames, ['tail', args.final, args.n])
 
 
 def view_note_cl():